@@ -8,9 +8,13 @@ Author: FReptar0
 
 import sys
 
-# Add package directory to path for proper imports
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent))
+# Only add the project directory to the path when the package is not installed
+try:
+    import nutanix_client
+except ImportError:
+    from pathlib import Path
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    import nutanix_client
 
 from nutanix_client.cli import main
 
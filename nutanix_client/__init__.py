@@ -6,13 +6,22 @@ A unified system for JWT generation, XML transformation, and API communication.
 __version__ = '1.0.1'
 __author__ = 'FReptar0'
 
+import importlib
+
 from nutanix_client.core.config import Config, ConfigError
 from nutanix_client.core.logger import Logger, get_logger
-from nutanix_client.handlers.jwt_handler import JWTHandler, JWTError
-from nutanix_client.handlers.xml_transformer import XMLTransformer, XMLTransformError
-from nutanix_client.handlers.api_client import APIClient, APIError
 from nutanix_client.utils.archiver import FileArchiver
 
+# Handlers pull in PyJWT/cryptography, lxml and requests; they are looked
+# up through nutanix_client.handlers, which imports each on first access
+# (PEP 562)
+def __getattr__(name):
+    handlers = importlib.import_module('nutanix_client.handlers')
+    if name in handlers.__all__:
+        return getattr(handlers, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     'Config',
     'ConfigError',
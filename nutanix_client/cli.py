@@ -3,17 +3,25 @@ CLI module for Nutanix API Client.
 Handles all command-line interface operations.
 """
 
+import os
 import sys
-import argparse
+import queue
+import signal
 import time
 from pathlib import Path
-from typing import Optional
+from types import SimpleNamespace
+from typing import List, Optional
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    # watchdog is optional; watch mode falls back to polling without it
+    Observer = None
+    FileSystemEventHandler = object
 
 from nutanix_client.core.config import Config, ConfigError
 from nutanix_client.core.logger import Logger, get_logger
-from nutanix_client.handlers.jwt_handler import JWTHandler, JWTError
-from nutanix_client.handlers.xml_transformer import XMLTransformer, XMLTransformError
-from nutanix_client.handlers.api_client import APIClient, APIError
 from nutanix_client.utils.archiver import (
     FileArchiver,
     validate_xml_file,
@@ -28,16 +36,91 @@ EXIT_AUTH_ERROR = 2
 EXIT_API_ERROR = 3
 EXIT_NETWORK_ERROR = 4
 
+# Seconds a new file's size and mtime must stay unchanged before it is
+# considered completely written
+FILE_SETTLE_INTERVAL = 1.0
+
+# How often a newly created file is checked for a close-after-write event
+FILE_CLOSE_POLL_INTERVAL = 0.05
+
+
+def _exit_on_signal(signum, frame):
+    """Turn a termination signal into a normal exit so atexit hooks run."""
+    sys.exit(128 + signum)
+
+
+class _XMLFileEventHandler(FileSystemEventHandler):
+    """
+    Queues XML files created in or moved into the watched directory.
+    
+    A file is queued at most once until it has been processed, so duplicate
+    notifications for the same file collapse into one entry. Only pending
+    paths are tracked, which keeps memory bounded by the backlog size.
+    
+    Files that were created but not yet reported closed may still be being
+    written; files that were closed, moved in, or found by the startup scan
+    are complete.
+    """
+    
+    def __init__(self, file_queue: queue.Queue):
+        """
+        Initialize the event handler.
+        
+        Args:
+            file_queue: Queue that receives paths of new XML files
+        """
+        super().__init__()
+        self.file_queue = file_queue
+        self._pending = set()
+        self._open = set()
+    
+    def enqueue(self, path: str):
+        """Queue a path if it names an XML file that is not already pending."""
+        if not path.lower().endswith('.xml') or path in self._pending:
+            return
+        self._pending.add(path)
+        self.file_queue.put(path)
+    
+    def done(self, path: str):
+        """Mark a queued path as processed so new events for it are accepted."""
+        self._pending.discard(path)
+        self._open.discard(path)
+    
+    def is_open(self, path: str) -> bool:
+        """Whether a path was created and may still be being written."""
+        return path in self._open
+    
+    def on_created(self, event):
+        """Handle a file created in the watched directory."""
+        if not event.is_directory:
+            self._open.add(event.src_path)
+            self.enqueue(event.src_path)
+    
+    def on_closed(self, event):
+        """Handle a file closed after writing (reported by inotify only)."""
+        if not event.is_directory:
+            self._open.discard(event.src_path)
+            self.enqueue(event.src_path)
+    
+    def on_moved(self, event):
+        """Handle a file moved or renamed into the watched directory."""
+        if not event.is_directory:
+            self.enqueue(event.dest_path)
+
 
 class NutanixAPIClient:
     """Main application controller."""
     
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None,
+                 load_handlers: bool = True):
         """
         Initialize the application.
         
         Args:
             config_path: Optional path to config file
+            load_handlers: Whether to initialize the JWT, XML and API handlers.
+                Commands that only touch the archives can skip them, which
+                avoids importing PyJWT/cryptography, lxml and requests.
         """
         try:
             # Load configuration
@@ -59,11 +142,13 @@ class NutanixAPIClient:
             )
             self.logger = get_logger()
             
-            self.logger.info("=" * 70)
-            self.logger.info("Nutanix API Client Starting")
-            self.logger.info(f"Environment: {self.config.environment.upper()}")
-            self.logger.info(f"API URL: {self.config.api_url}")
-            self.logger.info("=" * 70)
+            self.logger.info("\n".join([
+                "=" * 70,
+                "Nutanix API Client Starting",
+                f"Environment: {self.config.environment.upper()}",
+                f"API URL: {self.config.api_url}",
+                "=" * 70,
+            ]))
         except Exception as e:
             print(f"Logger Initialization Error: {e}", file=sys.stderr)
             sys.exit(EXIT_CONFIG_ERROR)
@@ -76,6 +161,24 @@ class NutanixAPIClient:
             sys.exit(EXIT_CONFIG_ERROR)
         
         # Initialize components
+        try:
+            self.archiver = FileArchiver(
+                self.config.archive_success_path,
+                self.config.archive_error_path
+            )
+        except Exception as e:
+            self.logger.error(f"Component initialization failed: {e}")
+            sys.exit(EXIT_CONFIG_ERROR)
+        
+        if load_handlers:
+            self._init_handlers()
+    
+    def _init_handlers(self):
+        """Initialize the JWT, XML and API handlers."""
+        from nutanix_client.handlers.jwt_handler import JWTHandler, JWTError
+        from nutanix_client.handlers.xml_transformer import XMLTransformer
+        from nutanix_client.handlers.api_client import APIClient
+        
         try:
             self.jwt_handler = JWTHandler(
                 self.config.jwt_private_key_path,
@@ -92,11 +195,6 @@ class NutanixAPIClient:
                 self.config.api_max_retries,
                 self.config.api_retry_delay
             )
-            
-            self.archiver = FileArchiver(
-                self.config.archive_success_path,
-                self.config.archive_error_path
-            )
         except JWTError as e:
             self.logger.error(f"JWT Handler initialization failed: {e}")
             sys.exit(EXIT_AUTH_ERROR)
@@ -114,6 +212,10 @@ class NutanixAPIClient:
         Returns:
             Exit code
         """
+        from nutanix_client.handlers.jwt_handler import JWTError
+        from nutanix_client.handlers.xml_transformer import XMLTransformError
+        from nutanix_client.handlers.api_client import APIError
+        
         start_time = time.time()
         
         try:
@@ -176,13 +278,15 @@ class NutanixAPIClient:
             
             # Success summary
             duration = time.time() - start_time
-            self.logger.info("=" * 70)
-            self.logger.info("✓ Processing completed successfully")
-            self.logger.info(f"  Duration: {format_duration(duration)}")
-            self.logger.info(f"  PO Number: {po_number or 'N/A'}")
-            self.logger.info(f"  Response: {response_file}")
-            self.logger.info(f"  Archived: {archived_file}")
-            self.logger.info("=" * 70)
+            self.logger.info("\n".join([
+                "=" * 70,
+                "✓ Processing completed successfully",
+                f"  Duration: {format_duration(duration)}",
+                f"  PO Number: {po_number or 'N/A'}",
+                f"  Response: {response_file}",
+                f"  Archived: {archived_file}",
+                "=" * 70,
+            ]))
             
             return EXIT_SUCCESS
             
@@ -199,34 +303,146 @@ class NutanixAPIClient:
         """
         Watch input directory for new files and process them.
         
+        Uses filesystem notifications (inotify, ReadDirectoryChangesW, ...)
+        through watchdog when it is installed, and polling otherwise.
+        
         Returns:
             Exit code (only returns on error or interruption)
         """
         self.logger.info(f"Watching directory: {self.config.input_path}")
         self.logger.info("Press Ctrl+C to stop")
         
-        processed_files = set()
+        # Service managers stop us with SIGTERM; exit normally so buffered
+        # log records are written out
+        signal.signal(signal.SIGTERM, _exit_on_signal)
+        
+        if Observer is None:
+            self.logger.warning("watchdog is not installed, falling back to polling")
+            return self._poll_directory()
+        
+        file_queue = queue.Queue()
+        handler = _XMLFileEventHandler(file_queue)
+        
+        observer = Observer()
+        observer.schedule(
+            handler,
+            self.config.input_path_str,
+            recursive=False
+        )
+        observer.start()
+        
+        try:
+            # Pick up files that arrived while we were not running. Scanning
+            # after the observer starts leaves no gap; duplicates collapse
+            # in the handler's pending set.
+            for xml_file in self._list_xml_files():
+                handler.enqueue(str(xml_file))
+            
+            while True:
+                # Short timeout keeps Ctrl+C responsive on every platform
+                try:
+                    path = file_queue.get(timeout=1)
+                except queue.Empty:
+                    continue
+                
+                xml_file = Path(path)
+                try:
+                    # Let writers finish files that were only just created;
+                    # skip files removed or renamed before we got to them
+                    if handler.is_open(path):
+                        ready = self._wait_until_written(xml_file, handler)
+                    else:
+                        ready = xml_file.exists()
+                    if ready:
+                        self.logger.info(f"New file detected: {xml_file.name}")
+                        self.process_file(xml_file)
+                        Logger.flush()
+                finally:
+                    handler.done(path)
+                
+        except KeyboardInterrupt:
+            self.logger.info("Watch mode interrupted by user")
+            return EXIT_SUCCESS
+        except Exception as e:
+            self.logger.error(f"Watch mode error: {e}", exc_info=True)
+            return EXIT_CONFIG_ERROR
+        finally:
+            observer.stop()
+            observer.join()
+    
+    def _wait_until_written(self, xml_file: Path,
+                            handler: _XMLFileEventHandler) -> bool:
+        """
+        Wait until a file is closed or its size and mtime stop changing.
+        
+        Creation events arrive as soon as a writer opens the file, usually
+        before the content is complete. Where the platform reports closes,
+        the wait ends as soon as the writer closes the file.
+        
+        Args:
+            xml_file: File to check
+            handler: Event handler tracking which files are still open
+            
+        Returns:
+            True once the file is complete, False if it disappeared
+        """
+        path = str(xml_file)
+        try:
+            st = xml_file.stat()
+            deadline = time.monotonic() + FILE_SETTLE_INTERVAL
+            while True:
+                time.sleep(FILE_CLOSE_POLL_INTERVAL)
+                if not handler.is_open(path):
+                    return xml_file.exists()
+                if time.monotonic() < deadline:
+                    continue
+                current = xml_file.stat()
+                if (current.st_size, current.st_mtime_ns) == (st.st_size, st.st_mtime_ns):
+                    return True
+                st = current
+                deadline = time.monotonic() + FILE_SETTLE_INTERVAL
+        except FileNotFoundError:
+            return False
+    
+    def _list_xml_files(self) -> list:
+        """
+        List XML files currently in the input directory.
+        
+        Uses os.scandir so file type checks come from the directory listing
+        and Path objects are only built for matching entries.
         
+        Returns:
+            List of XML file paths
+        """
+        with os.scandir(self.config.input_path_str) as entries:
+            return [
+                Path(entry.path) for entry in entries
+                if entry.name.lower().endswith('.xml')
+                and entry.is_file(follow_symlinks=False)
+            ]
+    
+    def _poll_directory(self) -> int:
+        """
+        Poll input directory for new files and process them.
+        
+        Returns:
+            Exit code (only returns on error or interruption)
+        """
         try:
             while True:
-                # Find all XML files in input directory
-                xml_files = list(self.config.input_path.glob('*.xml'))
+                # Processed files are archived out of the input directory,
+                # so every file found here still needs processing
+                xml_files = self._list_xml_files()
                 
                 for xml_file in xml_files:
-                    if xml_file in processed_files:
-                        continue
-                    
                     self.logger.info(f"New file detected: {xml_file.name}")
-                    exit_code = self.process_file(xml_file)
-                    
-                    if exit_code == EXIT_SUCCESS:
-                        processed_files.add(xml_file)
-                    
-                    # Small delay between files
-                    time.sleep(1)
+                    self.process_file(xml_file)
+                    Logger.flush()
                 
-                # Wait before checking again
-                time.sleep(5)
+                # Drain bursts back to back; only wait when the directory is
+                # empty or a file could not be archived (avoids a hot retry loop)
+                if not xml_files or any(f.exists() for f in xml_files):
+                    time.sleep(5)
                 
         except KeyboardInterrupt:
             self.logger.info("Watch mode interrupted by user")
@@ -298,8 +514,10 @@ def cmd_validate(args, client: NutanixAPIClient) -> int:
     return EXIT_SUCCESS
 
 
-def main():
-    """Main entry point for CLI."""
+def _build_parser():
+    """Build the argument parser for the full command-line interface."""
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description='Nutanix API Client - Unified XML processing and API communication',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -357,15 +575,46 @@ Examples:
     # Validate command
     validate_parser = subparsers.add_parser('validate', help='Validate configuration')
     
-    args = parser.parse_args()
+    return parser
+
+
+def _parse_fast_path(argv: List[str]) -> Optional[SimpleNamespace]:
+    """
+    Recognize the most common invocations without building the argparse parser.
     
-    if not args.command:
-        parser.print_help()
-        return EXIT_CONFIG_ERROR
+    Args:
+        argv: Command-line arguments (without the program name)
+        
+    Returns:
+        Parsed arguments, or None if the full parser is needed
+    """
+    if (len(argv) == 3 and argv[0] == 'process'
+            and argv[1] in ('-i', '--input') and not argv[2].startswith('-')):
+        return SimpleNamespace(config=None, command='process',
+                               input=argv[2], watch=False)
+    if argv == ['validate']:
+        return SimpleNamespace(config=None, command='validate')
+    return None
+
+
+def main():
+    """Main entry point for CLI."""
+    args = _parse_fast_path(sys.argv[1:])
+    
+    if args is None:
+        parser = _build_parser()
+        args = parser.parse_args()
+        
+        if not args.command:
+            parser.print_help()
+            return EXIT_CONFIG_ERROR
     
     # Initialize client
     try:
-        client = NutanixAPIClient(args.config)
+        client = NutanixAPIClient(
+            args.config,
+            load_handlers=args.command != 'cleanup'
+        )
     except SystemExit as e:
         return e.code
     
@@ -377,7 +626,7 @@ Examples:
     elif args.command == 'validate':
         return cmd_validate(args, client)
     else:
-        parser.print_help()
+        _build_parser().print_help()
         return EXIT_CONFIG_ERROR
 
 
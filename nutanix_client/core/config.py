@@ -3,18 +3,67 @@ Configuration management module for Nutanix API Client.
 Loads and validates configuration from config.yaml.
 """
 
+import json
 import os
+import stat
 import sys
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Any
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+
+# Dotted keys that must be present and non-empty in config.yaml
+_REQUIRED_FIELDS = (
+    'environment',
+    'api.uat.url',
+    'api.production.url',
+    'jwt.issuer',
+    'jwt.customer_id',
+    'jwt.private_key_path',
+    'paths.input',
+    'paths.output',
+    'paths.archive_success',
+    'paths.archive_error',
+    'logging.level.uat',
+    'logging.level.production',
+)
+
 
 class ConfigError(Exception):
     """Raised when configuration is invalid or missing."""
     pass
 
 
+@dataclass(frozen=True)
+class _ResolvedConfig:
+    """Validated settings, resolved once when the configuration is loaded."""
+    environment: str
+    api_url: str
+    jwt_issuer: str
+    jwt_customer_id: str
+    jwt_private_key_path: str
+    jwt_token_expiry_minutes: int
+    input_path: Path
+    input_path_str: str
+    output_path: Path
+    archive_success_path: Path
+    archive_error_path: Path
+    log_level: str
+    log_file: Path
+    log_max_size_mb: int
+    log_backup_count: int
+    api_timeout: int
+    api_max_retries: int
+    api_retry_delay: int
+    default_retention_days: int
+
+
 class Config:
     """
     Configuration manager for the Nutanix API Client.
@@ -40,46 +89,83 @@ class Config:
                 f"Please copy config/config.example.yaml to config/config.yaml and configure it."
             )
         
+        self._config = self._load(config_path)
+        self._validate_config()
+        self._resolved = self._resolve()
+    
+    def _load(self, config_path: Path) -> Any:
+        """
+        Load the YAML configuration, reusing a parsed JSON cache when current.
+        
+        The cache (e.g. config.yaml.json) records the size and modification
+        time of the YAML file it was built from and is rebuilt when either
+        changes.
+        
+        Args:
+            config_path: Path to config.yaml
+            
+        Returns:
+            Parsed configuration
+            
+        Raises:
+            ConfigError: If the file cannot be read or is not valid YAML
+        """
+        cache_path = config_path.with_name(config_path.name + '.json')
+        
         try:
+            st = config_path.stat()
+            source = [st.st_mtime_ns, st.st_size]
+            
+            try:
+                cached = json.loads(cache_path.read_bytes())
+                if cached['source'] == source:
+                    return cached['config']
+            except (OSError, ValueError, TypeError, KeyError):
+                pass
+            
             with open(config_path, 'r', encoding='utf-8') as f:
-                self._config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=_YamlLoader)
         except yaml.YAMLError as e:
             raise ConfigError(f"Invalid YAML in configuration file: {e}")
         except Exception as e:
             raise ConfigError(f"Error reading configuration file: {e}")
         
-        self._validate_config()
+        # Best effort: a read-only config directory or values JSON cannot
+        # represent (e.g. YAML dates) just mean there is no cache. JSON also
+        # silently turns non-string keys into strings, so only cache configs
+        # that survive the round trip unchanged. The cache holds the same
+        # secrets as the YAML, so it is created private and then given the
+        # YAML file's own permissions rather than the umask default.
+        try:
+            dumped = json.dumps({'source': source, 'config': config})
+            if json.loads(dumped)['config'] == config:
+                tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+                fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with open(fd, 'w', encoding='utf-8') as f:
+                    f.write(dumped)
+                os.chmod(tmp_path, stat.S_IMODE(st.st_mode))
+                os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError):
+            pass
+        
+        return config
     
     def _validate_config(self):
         """Validate that all required configuration is present."""
-        required_fields = [
-            'environment',
-            'api.uat.url',
-            'api.production.url',
-            'jwt.issuer',
-            'jwt.customer_id',
-            'jwt.private_key_path',
-            'paths.input',
-            'paths.output',
-            'paths.archive_success',
-            'paths.archive_error',
-            'logging.level.uat',
-            'logging.level.production',
-        ]
-        
-        missing_fields = []
-        for field in required_fields:
-            if not self._get_nested(field):
-                missing_fields.append(field)
+        self._flat = {}
+        self._flatten(self._config, '')
         
-        if missing_fields:
+        if not all(self._get_nested(field) for field in _REQUIRED_FIELDS):
+            missing_fields = [
+                field for field in _REQUIRED_FIELDS if not self._get_nested(field)
+            ]
             raise ConfigError(
                 f"Missing required configuration fields:\n" +
                 "\n".join(f"  - {field}" for field in missing_fields)
             )
         
         # Validate environment value
-        env = self.environment
+        env = self._get_nested('environment', 'uat')
         if env not in ['uat', 'production']:
             raise ConfigError(
                 f"Invalid environment '{env}'. Must be 'uat' or 'production'."
@@ -104,6 +190,56 @@ class Config:
         
         self._private_key_path_resolved = str(private_key_path)
     
+    def _resolve(self) -> _ResolvedConfig:
+        """
+        Resolve every setting once, after validation.
+        
+        Returns:
+            Immutable resolved settings
+        """
+        env = self._get_nested('environment', 'uat')
+        get = self._get_nested
+        
+        input_path = Path(get('paths.input'))
+        
+        return _ResolvedConfig(
+            environment=env,
+            api_url=get(f'api.{env}.url'),
+            jwt_issuer=get('jwt.issuer'),
+            jwt_customer_id=get('jwt.customer_id'),
+            jwt_private_key_path=self._private_key_path_resolved,
+            jwt_token_expiry_minutes=get('jwt.token_expiry_minutes', 5),
+            input_path=input_path,
+            input_path_str=str(input_path),
+            output_path=Path(get('paths.output')),
+            archive_success_path=Path(get('paths.archive_success')),
+            archive_error_path=Path(get('paths.archive_error')),
+            log_level=get(f'logging.level.{env}', 'INFO'),
+            log_file=Path(get('logging.file', './logs/nutanix-api-client.log')),
+            log_max_size_mb=get('logging.max_size_mb', 10),
+            log_backup_count=get('logging.backup_count', 5),
+            api_timeout=get('api_settings.timeout', 30),
+            api_max_retries=get('api_settings.max_retries', 3),
+            api_retry_delay=get('api_settings.retry_delay', 5),
+            default_retention_days=get('archive_cleanup.default_retention_days', 30),
+        )
+    
+    def _flatten(self, node: Any, prefix: str):
+        """
+        Populate the flat lookup map with every dotted key in a config subtree.
+        
+        Args:
+            node: Configuration subtree to walk
+            prefix: Dotted key of the subtree ('' for the root)
+        """
+        if not isinstance(node, dict):
+            return
+        
+        for k, value in node.items():
+            key = f"{prefix}{k}"
+            self._flat[key] = value
+            self._flatten(value, f"{key}.")
+    
     def _get_nested(self, key: str, default=None) -> Any:
         """
         Get a nested configuration value using dot notation.
@@ -115,106 +251,102 @@ class Config:
         Returns:
             Configuration value or default
         """
-        keys = key.split('.')
-        value = self._config
-        
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
-        
-        return value
+        return self._flat.get(key, default)
     
     @property
     def environment(self) -> str:
         """Get current environment (uat or production)."""
-        return self._config.get('environment', 'uat')
+        return self._resolved.environment
     
     @property
     def api_url(self) -> str:
         """Get API URL for current environment."""
-        return self._get_nested(f'api.{self.environment}.url')
+        return self._resolved.api_url
     
     @property
     def jwt_issuer(self) -> str:
         """Get JWT issuer."""
-        return self._get_nested('jwt.issuer')
+        return self._resolved.jwt_issuer
     
     @property
     def jwt_customer_id(self) -> str:
         """Get JWT customer ID."""
-        return self._get_nested('jwt.customer_id')
+        return self._resolved.jwt_customer_id
     
     @property
     def jwt_private_key_path(self) -> str:
         """Get private key file path (resolved to absolute path)."""
-        return self._private_key_path_resolved
+        return self._resolved.jwt_private_key_path
     
     @property
     def jwt_token_expiry_minutes(self) -> int:
         """Get JWT token expiry in minutes."""
-        return self._get_nested('jwt.token_expiry_minutes', 5)
+        return self._resolved.jwt_token_expiry_minutes
     
     @property
     def input_path(self) -> Path:
         """Get input directory path."""
-        return Path(self._get_nested('paths.input'))
+        return self._resolved.input_path
+    
+    @property
+    def input_path_str(self) -> str:
+        """Get input directory path as a string (for os-level calls)."""
+        return self._resolved.input_path_str
     
     @property
     def output_path(self) -> Path:
         """Get output directory path."""
-        return Path(self._get_nested('paths.output'))
+        return self._resolved.output_path
     
     @property
     def archive_success_path(self) -> Path:
         """Get success archive directory path."""
-        return Path(self._get_nested('paths.archive_success'))
+        return self._resolved.archive_success_path
     
     @property
     def archive_error_path(self) -> Path:
         """Get error archive directory path."""
-        return Path(self._get_nested('paths.archive_error'))
+        return self._resolved.archive_error_path
     
     @property
     def log_level(self) -> str:
         """Get log level for current environment."""
-        return self._get_nested(f'logging.level.{self.environment}', 'INFO')
+        return self._resolved.log_level
     
     @property
     def log_file(self) -> Path:
         """Get log file path."""
-        return Path(self._get_nested('logging.file', './logs/nutanix-api-client.log'))
+        return self._resolved.log_file
     
     @property
     def log_max_size_mb(self) -> int:
         """Get maximum log file size in MB."""
-        return self._get_nested('logging.max_size_mb', 10)
+        return self._resolved.log_max_size_mb
     
     @property
     def log_backup_count(self) -> int:
         """Get number of backup log files to keep."""
-        return self._get_nested('logging.backup_count', 5)
+        return self._resolved.log_backup_count
     
     @property
     def api_timeout(self) -> int:
         """Get API request timeout in seconds."""
-        return self._get_nested('api_settings.timeout', 30)
+        return self._resolved.api_timeout
     
     @property
     def api_max_retries(self) -> int:
         """Get maximum retry attempts."""
-        return self._get_nested('api_settings.max_retries', 3)
+        return self._resolved.api_max_retries
     
     @property
     def api_retry_delay(self) -> int:
         """Get delay between retries in seconds."""
-        return self._get_nested('api_settings.retry_delay', 5)
+        return self._resolved.api_retry_delay
     
     @property
     def default_retention_days(self) -> int:
         """Get default archive retention period in days."""
-        return self._get_nested('archive_cleanup.default_retention_days', 30)
+        return self._resolved.default_retention_days
     
     def ensure_directories(self):
         """Create all required directories if they don't exist."""
@@ -227,7 +359,10 @@ class Config:
         ]
         
         for directory in directories:
+            # Steady state is that every directory already exists
+            if os.path.isdir(directory):
+                continue
             try:
-                directory.mkdir(parents=True, exist_ok=True)
+                os.makedirs(directory, exist_ok=True)
             except Exception as e:
                 raise ConfigError(f"Failed to create directory {directory}: {e}")
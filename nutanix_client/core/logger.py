@@ -3,10 +3,17 @@ Centralized logging module for Nutanix API Client.
 Provides structured logging with file rotation and console output.
 """
 
+import atexit
 import logging
+import queue
 import sys
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import (
+    MemoryHandler,
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+)
 from typing import Optional
 
 
@@ -14,10 +21,24 @@ class Logger:
     """
     Centralized logger for the application.
     Configures both file and console logging with rotation.
+    
+    Console output is written synchronously so it stays in order with the
+    CLI's own print() output. File records are handed to a background
+    thread through a queue, so callers never block on file writes or
+    rotation (QueueHandler still formats the message in the caller).
     """
     
     _instance: Optional['Logger'] = None
     _logger: Optional[logging.Logger] = None
+    _listener: Optional[QueueListener] = None
+    _queue: Optional[queue.Queue] = None
+    _file_buffer: Optional[MemoryHandler] = None
+    
+    def __new__(cls, *args, **kwargs):
+        """Return the existing instance instead of allocating a new one."""
+        if cls._instance is not None:
+            return cls._instance
+        return super().__new__(cls)
     
     def __init__(self, log_file: Path, log_level: str = 'INFO', 
                  max_size_mb: int = 10, backup_count: int = 5):
@@ -37,9 +58,11 @@ class Logger:
         # Set class attributes
         Logger._instance = self
         
+        level = getattr(logging, log_level.upper(), logging.INFO)
+        
         # Create logger
         Logger._logger = logging.getLogger('nutanix-api-client')
-        Logger._logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
+        Logger._logger.setLevel(level)
         
         # Remove existing handlers
         Logger._logger.handlers.clear()
@@ -67,13 +90,37 @@ class Logger:
         )
         file_handler.setLevel(logging.DEBUG)  # Log everything to file
         file_handler.setFormatter(file_formatter)
-        Logger._logger.addHandler(file_handler)
+        
+        # Write the file in batches (rotation check + write per batch);
+        # warnings and errors are flushed immediately
+        buffered_file_handler = MemoryHandler(
+            capacity=64,
+            flushLevel=logging.WARNING,
+            target=file_handler
+        )
+        Logger._file_buffer = buffered_file_handler
         
         # Console handler
         console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(getattr(logging, log_level.upper(), logging.INFO))
+        console_handler.setLevel(level)
         console_handler.setFormatter(console_formatter)
+        
+        # The console stays on the calling thread; the file handler runs on
+        # the listener thread and the logger only enqueues for it
+        log_queue = queue.Queue(-1)
+        Logger._queue = log_queue
         Logger._logger.addHandler(console_handler)
+        Logger._logger.addHandler(QueueHandler(log_queue))
+        Logger._listener = QueueListener(
+            log_queue,
+            buffered_file_handler,
+            respect_handler_level=True
+        )
+        Logger._listener.start()
+        
+        # Runs last-registered-first: drain the queue, then flush the buffer
+        atexit.register(buffered_file_handler.flush)
+        atexit.register(Logger._listener.stop)
     
     @classmethod
     def get_logger(cls) -> logging.Logger:
@@ -82,6 +129,20 @@ class Logger:
             raise RuntimeError("Logger not initialized. Call Logger.__init__() first.")
         return cls._logger
     
+    @classmethod
+    def flush(cls):
+        """
+        Write all pending records to the log file.
+        
+        Waits for the listener thread to handle everything already queued,
+        then flushes the file buffer. Long-running modes call this after
+        each unit of work so the file log does not lag behind.
+        """
+        if cls._listener is None:
+            return
+        cls._queue.join()
+        cls._file_buffer.flush()
+    
     @classmethod
     def initialize(cls, log_file: Path, log_level: str = 'INFO',
                   max_size_mb: int = 10, backup_count: int = 5):
@@ -97,7 +158,7 @@ class Logger:
         Returns:
             Logger instance
         """
-        if cls._instance is not None:
+        if cls._instance is not None and cls._logger is not None:
             return cls._instance
         
         instance = cls(log_file, log_level, max_size_mb, backup_count)
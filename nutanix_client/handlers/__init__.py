@@ -1,8 +1,24 @@
 """Business logic handlers for JWT, XML, and API operations."""
 
-from nutanix_client.handlers.jwt_handler import JWTHandler, JWTError
-from nutanix_client.handlers.xml_transformer import XMLTransformer, XMLTransformError
-from nutanix_client.handlers.api_client import APIClient, APIError
+import importlib
+
+# Imported on first access so that using one handler does not load the
+# third-party dependencies of the others (PEP 562)
+_LAZY = {
+    'JWTHandler': 'nutanix_client.handlers.jwt_handler',
+    'JWTError': 'nutanix_client.handlers.jwt_handler',
+    'XMLTransformer': 'nutanix_client.handlers.xml_transformer',
+    'XMLTransformError': 'nutanix_client.handlers.xml_transformer',
+    'APIClient': 'nutanix_client.handlers.api_client',
+    'APIError': 'nutanix_client.handlers.api_client',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        return getattr(importlib.import_module(_LAZY[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'JWTHandler',
@@ -3,11 +3,59 @@ API client module for Nutanix API Client.
 Handles HTTP communication with the Nutanix API.
 """
 
+import io
+import logging
+import os
+import random
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import takewhile
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Union
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException, Timeout, ConnectionError
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.retry import Retry
+
+try:
+    from lxml import etree
+except ImportError:
+    # Response validation is skipped without lxml
+    etree = None
+
+from nutanix_client.core.logger import get_logger
+
+
+_PO_NUMBER_RE = re.compile(
+    rb'<(?:\w+:)?DistiPONumber>([^<]+)</(?:\w+:)?DistiPONumber>'
+)
+
+
+# Statuses retried by the transport (rate limiting and transient server errors)
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Clark-notation tags of the response elements checked by validate_response
+_NS_URL = 'http://www.nutanix.com/schemas/Services/Data/NTNXPartnerPO.xsd'
+_TAG_RESPONSE = '{%s}Response' % _NS_URL
+_TAG_FAULT = '{%s}fault' % _NS_URL
+_TAG_TX_STATUS = '{%s}TxStatus' % _NS_URL
+_TAG_ERROR_CODE = '{%s}Errorcode' % _NS_URL
+_TAG_ERROR_DETAIL = '{%s}Errordetail' % _NS_URL
+_TAG_TRANSACTION_ID = '{%s}TransactionID' % _NS_URL
+
+# Required parent chain (nearest first) for each element of interest
+_RESPONSE_FIELD_PARENTS = {
+    _TAG_TX_STATUS: (_TAG_RESPONSE,),
+    _TAG_ERROR_CODE: (_TAG_FAULT, _TAG_RESPONSE),
+    _TAG_ERROR_DETAIL: (_TAG_FAULT, _TAG_RESPONSE),
+    _TAG_TRANSACTION_ID: (_TAG_RESPONSE,),
+}
+_RESPONSE_FIELD_TAGS = tuple(_RESPONSE_FIELD_PARENTS)
+
+# TxStatus values (lowercased) that mean the order went through
+_SUCCESS_STATES = frozenset({'received', 'accepted', 'pending'})
 
 
 class APIError(Exception):
@@ -15,6 +63,92 @@ class APIError(Exception):
     pass
 
 
+class _LoggedRetry(Retry):
+    """
+    urllib3 retry policy that reports each retry in the application log,
+    backs off from the first retry on, and caps how long a Retry-After
+    header can make us wait.
+    """
+    
+    # Per-client settings (set by APIClient._build_retry); copied onto every
+    # policy urllib3 derives from this one
+    backoff_cap = None
+    jitter = 0.0
+    retry_after_cap = None
+    
+    def new(self, **kw):
+        """
+        Derive the policy for the next attempt, keeping the client settings.
+        
+        Returns:
+            New retry policy
+        """
+        retry = super().new(**kw)
+        retry.backoff_cap = self.backoff_cap
+        retry.jitter = self.jitter
+        retry.retry_after_cap = self.retry_after_cap
+        return retry
+    
+    def get_backoff_time(self) -> float:
+        """
+        Delay before the next attempt.
+        
+        urllib3 does not wait before the first retry; this waits
+        backoff_factor * 2**(n-1) seconds plus random jitter after the n-th
+        consecutive failure, capped at backoff_cap.
+        
+        Returns:
+            Delay in seconds
+        """
+        failures = len(list(takewhile(
+            lambda h: h.redirect_location is None, reversed(self.history)
+        )))
+        if failures == 0:
+            return 0.0
+        delay = self.backoff_factor * (2 ** (failures - 1))
+        delay += random.random() * self.jitter
+        if self.backoff_cap is not None:
+            delay = min(delay, self.backoff_cap)
+        return max(delay, 0.0)
+    
+    def get_retry_after(self, response):
+        """
+        Read the Retry-After delay from a response, capped at retry_after_cap.
+        
+        Args:
+            response: urllib3 response
+            
+        Returns:
+            Delay in seconds, or None if the header is absent
+        """
+        retry_after = super().get_retry_after(response)
+        if retry_after is not None and self.retry_after_cap is not None:
+            return min(retry_after, self.retry_after_cap)
+        return retry_after
+    
+    def increment(self, method=None, url=None, response=None, error=None,
+                  _pool=None, _stacktrace=None):
+        """
+        Record a failed attempt and log the upcoming retry.
+        
+        Raises:
+            MaxRetryError: Once retries are exhausted
+            
+        Returns:
+            Retry policy for the next attempt
+        """
+        retry = super().increment(
+            method, url, response=response, error=error,
+            _pool=_pool, _stacktrace=_stacktrace
+        )
+        cause = f"HTTP {response.status}" if response is not None else repr(error)
+        get_logger().warning(
+            f"Request attempt failed ({cause}), will retry "
+            f"({retry.total} retries left)"
+        )
+        return retry
+
+
 class APIClient:
     """
     Handles communication with the Nutanix API.
@@ -22,145 +156,201 @@ class APIClient:
     """
     
     def __init__(self, api_url: str, timeout: int = 30, 
-                 max_retries: int = 3, retry_delay: int = 5):
+                 max_retries: int = 3, retry_delay: int = 5,
+                 retry_cap: int = 60):
         """
         Initialize API client.
         
         Args:
             api_url: Base URL for the API endpoint
             timeout: Request timeout in seconds
-            max_retries: Maximum number of retry attempts
-            retry_delay: Delay between retries in seconds
+            max_retries: Maximum number of attempts per request
+            retry_delay: Backoff factor between retries in seconds (doubled
+                on each attempt, with random jitter)
+            retry_cap: Upper bound for the backoff delay in seconds
         """
         self.api_url = api_url
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_delay = retry_delay
-        self.logger = None
+        self.retry_cap = retry_cap
+        
+        # One session for all requests so connections (and TLS sessions)
+        # are kept alive and reused across purchase orders and retries
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=self._build_retry()
+        )
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        self._session.headers.update({
+            'Content-Type': 'text/xml',
+            'SOAPAction': 'GetPurchaseOrder',
+            # SOAP responses compress well; requests decompresses transparently
+            'Accept-Encoding': 'gzip, deflate'
+        })
     
-    def _get_logger(self):
-        """Lazy logger initialization."""
-        if self.logger is None:
-            from nutanix_client.core.logger import get_logger
-            self.logger = get_logger()
-        return self.logger
+    def close(self):
+        """Close pooled connections."""
+        self._session.close()
     
-    def post_purchase_order(self, jwt_token: str, xml_content: str) -> str:
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def _build_retry(self) -> Retry:
+        """
+        Build the urllib3 retry policy used by the session's adapter.
+        
+        Connection errors, read timeouts and the statuses in _RETRY_STATUSES
+        are retried with exponential backoff starting at retry_delay (plus
+        up to retry_delay of jitter, capped at retry_cap), honoring
+        Retry-After up to retry_cap seconds. Each retry is logged as a
+        warning. Once retries run out, the last response is returned so the
+        normal status handling reports it.
+        
+        Returns:
+            Retry policy
+        """
+        retry = _LoggedRetry(
+            total=max(self.max_retries - 1, 0),
+            backoff_factor=self.retry_delay,
+            status_forcelist=_RETRY_STATUSES,
+            allowed_methods=frozenset(['POST']),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        retry.backoff_cap = self.retry_cap
+        retry.jitter = self.retry_delay
+        retry.retry_after_cap = self.retry_cap
+        return retry
+    
+    def post_purchase_order(self, jwt_token: str,
+                            xml_content: Union[str, bytes]) -> bytes:
         """
         Post a purchase order to the Nutanix API.
         
         Args:
             jwt_token: JWT authentication token
-            xml_content: XML content to send (SOAP-wrapped)
+            xml_content: XML content to send (SOAP-wrapped), as str or
+                UTF-8 bytes
             
         Returns:
-            API response XML as string
+            API response XML as raw bytes (as received, not decoded)
             
         Raises:
             APIError: If API request fails
         """
+        # Content-Type and SOAPAction are set on the session
         headers = {
-            'Content-Type': 'text/xml',
-            'x-frontline-jwt': jwt_token,
-            'SOAPAction': 'GetPurchaseOrder'
+            'x-frontline-jwt': jwt_token
         }
         
-        attempt = 0
-        last_error = None
+        # Encode once; every retry sends the same buffer
+        body = xml_content.encode('utf-8') if isinstance(xml_content, str) else xml_content
+        
+        log = get_logger()
+        
+        try:
+            log.info(
+                f"Sending request to {self.api_url} (up to {self.max_retries} attempts)"
+            )
+            log.debug("Request headers: %s", headers)
+            
+            response = self._session.post(
+                self.api_url,
+                data=body,
+                headers=headers,
+                timeout=self.timeout
+            )
+        except Timeout:
+            raise APIError(f"Request timeout after {self.timeout} seconds")
+        except ConnectionError as e:
+            # Exhausted read-timeout retries surface as a ConnectionError
+            # wrapping urllib3's MaxRetryError
+            reason = getattr(e.args[0], 'reason', None) if e.args else None
+            if isinstance(reason, ReadTimeoutError):
+                raise APIError(f"Request timeout after {self.timeout} seconds")
+            raise APIError(f"Connection error: {e}")
+        except RequestException as e:
+            raise APIError(f"HTTP request failed: {e}")
+        
+        log.info(f"Received response: HTTP {response.status_code}")
+        
+        # Check for HTTP errors (retryable statuses only get here once
+        # retries are exhausted)
+        if response.status_code == 401:
+            raise APIError(
+                "Authentication failed (HTTP 401). "
+                "Check JWT token configuration."
+            )
+        elif response.status_code == 403:
+            raise APIError(
+                "Access forbidden (HTTP 403). "
+                "Check customer ID and permissions."
+            )
+        elif response.status_code == 400:
+            raise APIError(
+                f"Bad request (HTTP 400). Invalid XML or request format.\n"
+                f"Response: {response.text[:500]}"
+            )
+        elif response.status_code == 429 or response.status_code >= 500:
+            reason = "Rate limited" if response.status_code == 429 else "Server error"
+            raise APIError(
+                f"{reason} (HTTP {response.status_code}). "
+                f"Response: {response.text[:200]}"
+            )
+        elif response.status_code != 200:
+            raise APIError(
+                f"Unexpected response (HTTP {response.status_code}): "
+                f"{response.text[:500]}"
+            )
+        
+        # Success - HTTP 200
+        log.info("Request successful")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Response length: %d bytes", len(response.content))
         
-        while attempt < self.max_retries:
-            attempt += 1
+        # Validate business logic in response. Work on the raw body: decoding
+        # it to str and re-encoding it for the parser and the response file
+        # would copy it twice
+        self.validate_response(response.content)
+        
+        return response.content
+    
+    def post_purchase_orders(self, jwt_token: str,
+                             xml_contents: List[Union[str, bytes]],
+                             max_workers: int = 4) -> List[Union[bytes, APIError]]:
+        """
+        Post several purchase orders concurrently.
+        
+        Requests run on a thread pool so their network round trips overlap
+        (the GIL is released while waiting on the socket). Each order gets
+        the same retry handling as post_purchase_order.
+        
+        Args:
+            jwt_token: JWT authentication token
+            xml_contents: XML contents to send (SOAP-wrapped)
+            max_workers: Maximum number of requests in flight
             
+        Returns:
+            One entry per input, in order: the response XML bytes, or the APIError
+            raised for that order
+        """
+        def post(xml_content: Union[str, bytes]) -> Union[bytes, APIError]:
             try:
-                self._get_logger().info(
-                    f"Sending request to {self.api_url} (attempt {attempt}/{self.max_retries})"
-                )
-                self._get_logger().debug(f"Request headers: {headers}")
-                
-                response = requests.post(
-                    self.api_url,
-                    data=xml_content.encode('utf-8'),
-                    headers=headers,
-                    timeout=self.timeout
-                )
-                
-                self._get_logger().info(f"Received response: HTTP {response.status_code}")
-                
-                # Check for HTTP errors
-                if response.status_code == 401:
-                    raise APIError(
-                        "Authentication failed (HTTP 401). "
-                        "Check JWT token configuration."
-                    )
-                elif response.status_code == 403:
-                    raise APIError(
-                        "Access forbidden (HTTP 403). "
-                        "Check customer ID and permissions."
-                    )
-                elif response.status_code == 400:
-                    raise APIError(
-                        f"Bad request (HTTP 400). Invalid XML or request format.\n"
-                        f"Response: {response.text[:500]}"
-                    )
-                elif response.status_code >= 500:
-                    # Server errors - retry
-                    last_error = APIError(
-                        f"Server error (HTTP {response.status_code}). "
-                        f"Response: {response.text[:200]}"
-                    )
-                    self._get_logger().warning(f"Server error, will retry: {last_error}")
-                    
-                    if attempt < self.max_retries:
-                        time.sleep(self.retry_delay)
-                        continue
-                    else:
-                        raise last_error
-                elif response.status_code != 200:
-                    raise APIError(
-                        f"Unexpected response (HTTP {response.status_code}): "
-                        f"{response.text[:500]}"
-                    )
-                
-                # Success - HTTP 200
-                self._get_logger().info("Request successful")
-                self._get_logger().debug(f"Response length: {len(response.text)} bytes")
-                
-                # Validate business logic in response
-                self.validate_response(response.text)
-                
-                return response.text
-                
-            except Timeout:
-                last_error = APIError(
-                    f"Request timeout after {self.timeout} seconds"
-                )
-                self._get_logger().warning(f"Timeout on attempt {attempt}: {last_error}")
-                
-                if attempt < self.max_retries:
-                    time.sleep(self.retry_delay)
-                    continue
-                else:
-                    raise last_error
-                    
-            except ConnectionError as e:
-                last_error = APIError(f"Connection error: {e}")
-                self._get_logger().warning(f"Connection error on attempt {attempt}: {e}")
-                
-                if attempt < self.max_retries:
-                    time.sleep(self.retry_delay)
-                    continue
-                else:
-                    raise last_error
-                    
-            except RequestException as e:
-                raise APIError(f"HTTP request failed: {e}")
+                return self.post_purchase_order(jwt_token, xml_content)
+            except APIError as e:
+                return e
         
-        # Should not reach here, but just in case
-        if last_error:
-            raise last_error
-        raise APIError("Request failed after all retry attempts")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(post, xml_contents))
     
-    def validate_response(self, response_xml: str) -> None:
+    def validate_response(self, response_xml: Union[str, bytes]) -> None:
         """
         Validate Nutanix API response for business logic errors.
         
@@ -168,46 +358,44 @@ class APIClient:
         This method checks the TxStatus and fault elements.
         
         Args:
-            response_xml: XML response from API
+            response_xml: XML response from API (str or raw bytes)
             
         Raises:
             APIError: If transaction was rejected or contains faults
         """
+        if etree is None:
+            get_logger().warning("lxml unavailable; skipping response validation")
+            return
+        
         try:
-            from lxml import etree
-            
-            # Parse XML
-            root = etree.fromstring(response_xml.encode('utf-8'))
-            
-            # Define namespace
-            ns = {'ns1': 'http://www.nutanix.com/schemas/Services/Data/NTNXPartnerPO.xsd'}
-            
-            # Find TxStatus element
-            tx_status_elem = root.find('.//ns1:Response/ns1:TxStatus', ns)
+            # Collect all fields in one streaming pass; the first match wins
+            found = {}
+            context = etree.iterparse(
+                io.BytesIO(
+                    response_xml.encode('utf-8')
+                    if isinstance(response_xml, str) else response_xml
+                ),
+                events=('end',),
+                tag=_RESPONSE_FIELD_TAGS
+            )
+            for _, elem in context:
+                if (elem.tag not in found
+                        and self._has_parents(elem, _RESPONSE_FIELD_PARENTS[elem.tag])):
+                    found[elem.tag] = elem.text.strip() if elem.text else ""
+                elem.clear()
             
-            if tx_status_elem is not None:
-                tx_status = tx_status_elem.text.strip() if tx_status_elem.text else ""
+            if _TAG_TX_STATUS in found:
+                tx_status = found[_TAG_TX_STATUS]
                 
-                self._get_logger().info(f"API Transaction Status: {tx_status}")
+                get_logger().info(f"API Transaction Status: {tx_status}")
+                status = tx_status.lower()
                 
                 # Check if rejected
-                if tx_status.lower() == 'rejected':
+                if status == 'rejected':
                     # Extract fault details
-                    error_code = ""
-                    error_detail = ""
-                    transaction_id = ""
-                    
-                    error_code_elem = root.find('.//ns1:Response/ns1:fault/ns1:Errorcode', ns)
-                    if error_code_elem is not None and error_code_elem.text:
-                        error_code = error_code_elem.text.strip()
-                    
-                    error_detail_elem = root.find('.//ns1:Response/ns1:fault/ns1:Errordetail', ns)
-                    if error_detail_elem is not None and error_detail_elem.text:
-                        error_detail = error_detail_elem.text.strip()
-                    
-                    transaction_id_elem = root.find('.//ns1:Response/ns1:TransactionID', ns)
-                    if transaction_id_elem is not None and transaction_id_elem.text:
-                        transaction_id = transaction_id_elem.text.strip()
+                    error_code = found.get(_TAG_ERROR_CODE, "")
+                    error_detail = found.get(_TAG_ERROR_DETAIL, "")
+                    transaction_id = found.get(_TAG_TRANSACTION_ID, "")
                     
                     # Raise detailed error
                     error_msg = f"Purchase Order REJECTED by Nutanix API\n"
@@ -220,23 +408,22 @@ class APIClient:
                     else:
                         error_msg += "  No error details provided"
                     
-                    self._get_logger().error(error_msg)
+                    get_logger().error(error_msg)
                     raise APIError(error_msg)
                 
-                elif tx_status.lower() in ['received', 'accepted', 'pending']:
-                    # These are success states
-                    self._get_logger().info(f"✓ Purchase Order {tx_status}")
+                elif status in _SUCCESS_STATES:
+                    get_logger().info(f"[OK] Purchase Order {tx_status}")
                     return
                 else:
                     # Unknown status - log warning but don't fail
-                    self._get_logger().warning(
+                    get_logger().warning(
                         f"Unknown TxStatus '{tx_status}' - treating as success. "
                         f"Please verify with Nutanix API documentation."
                     )
                     return
             else:
                 # No TxStatus found - log warning
-                self._get_logger().warning(
+                get_logger().warning(
                     "No TxStatus element found in response. "
                     "Cannot validate transaction status."
                 )
@@ -246,18 +433,37 @@ class APIClient:
             raise
         except Exception as e:
             # XML parsing errors - log but don't fail
-            self._get_logger().warning(
+            get_logger().warning(
                 f"Could not validate response XML: {e}. "
                 f"Proceeding anyway."
             )
     
-    def save_response(self, response_xml: str, output_path: Path, 
+    @staticmethod
+    def _has_parents(elem, tags) -> bool:
+        """
+        Check that an element's ancestors have the given tags.
+        
+        Args:
+            elem: lxml element
+            tags: Expected ancestor tags, nearest parent first
+            
+        Returns:
+            True if the ancestor chain matches, False otherwise
+        """
+        parent = elem.getparent()
+        for tag in tags:
+            if parent is None or parent.tag != tag:
+                return False
+            parent = parent.getparent()
+        return True
+    
+    def save_response(self, response_xml: Union[str, bytes], output_path: Path, 
                      po_number: Optional[str] = None) -> Path:
         """
         Save API response to file.
         
         Args:
-            response_xml: Response XML content
+            response_xml: Response XML content (str, or bytes written as-is)
             output_path: Directory to save response
             po_number: Purchase order number (for filename)
             
@@ -281,34 +487,45 @@ class APIClient:
             output_file = output_path / filename
             
             # Save response
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(response_xml)
+            if isinstance(response_xml, str):
+                response_xml = response_xml.encode('utf-8')
             
-            self._get_logger().info(f"Saved response to {output_file}")
+            # Write to a temporary file and rename, so readers never see a
+            # partially written response
+            tmp_file = output_file.with_name(output_file.name + '.tmp')
+            tmp_file.write_bytes(response_xml)
+            os.replace(tmp_file, output_file)
+            
+            get_logger().info(f"Saved response to {output_file}")
             return output_file
             
         except Exception as e:
             raise APIError(f"Failed to save response: {e}")
     
-    def extract_po_number(self, xml_content: str) -> Optional[str]:
+    def extract_po_number(self, xml_content: Union[str, bytes]) -> Optional[str]:
         """
         Extract PO number from XML content for filename generation.
         
         Args:
-            xml_content: XML content to parse
+            xml_content: XML content to parse (str or UTF-8 bytes)
             
         Returns:
             PO number if found, None otherwise
         """
-        try:
-            # Simple regex-based extraction
-            import re
-            match = re.search(r'<(?:\w+:)?DistiPONumber>([^<]+)</(?:\w+:)?DistiPONumber>', xml_content)
-            if match:
-                po_number = match.group(1)
-                self._get_logger().debug(f"Extracted PO number: {po_number}")
-                return po_number
-        except Exception as e:
-            self._get_logger().warning(f"Could not extract PO number: {e}")
+        if isinstance(xml_content, str):
+            xml_content = xml_content.encode('utf-8')
+        
+        # Cheap literal scan first: skip documents without the element and
+        # start the regex at the first candidate tag instead of the top
+        start = xml_content.find(b'DistiPONumber>')
+        if start < 0:
+            return None
+        start = max(xml_content.rfind(b'<', 0, start), 0)
+        
+        match = _PO_NUMBER_RE.search(xml_content, start)
+        if match:
+            po_number = match.group(1).decode('utf-8')
+            get_logger().debug("Extracted PO number: %s", po_number)
+            return po_number
         
         return None
@@ -3,10 +3,16 @@ JWT token generation module for Nutanix API Client.
 Handles RSA-based JWT token creation for API authentication.
 """
 
+import base64
+import json
 import jwt
-import datetime
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
+
+from nutanix_client.core.logger import get_logger
 
 
 class JWTError(Exception):
@@ -34,37 +40,58 @@ class JWTHandler:
         self.issuer = issuer
         self.customer_id = customer_id
         self.expiry_minutes = expiry_minutes
-        self.logger = None
         
-        # Load private key
+        # Signed token reused until it is close to expiry
+        self._cached_token = None
+        self._cached_exp = 0.0
+        self._skew = 30
+        self._lock = threading.Lock()
+        
+        # Load and parse private key once, so signing skips PEM decoding
         try:
-            with open(private_key_path, 'r') as key_file:
-                self.private_key = key_file.read()
+            with open(private_key_path, 'rb') as key_file:
+                self._private_key = load_pem_private_key(key_file.read(), password=None)
         except FileNotFoundError:
             raise JWTError(f"Private key file not found: {private_key_path}")
         except Exception as e:
             raise JWTError(f"Error reading private key: {e}")
     
-    def _get_logger(self):
-        """Lazy logger initialization."""
-        if self.logger is None:
-            from nutanix_client.core.logger import get_logger
-            self.logger = get_logger()
-        return self.logger
-    
     def generate_token(self) -> str:
         """
-        Generate a new JWT token.
+        Get a JWT token, signing a new one only when needed.
+        
+        The last token is reused until it is within 30 seconds of expiry.
         
         Returns:
             JWT token string
             
+        Raises:
+            JWTError: If token generation fails
+        """
+        with self._lock:
+            if self._cached_token and time.time() + self._skew < self._cached_exp:
+                get_logger().debug("Reusing cached JWT token")
+                return self._cached_token
+            
+            token, expiry = self._sign_token()
+            self._cached_token = token
+            self._cached_exp = expiry
+            return token
+    
+    def _sign_token(self) -> Tuple[str, int]:
+        """
+        Sign a new JWT token.
+        
+        Returns:
+            Tuple of (JWT token string, expiry as a Unix timestamp)
+            
         Raises:
             JWTError: If token generation fails
         """
         try:
-            now = datetime.datetime.utcnow()
-            expiry = now + datetime.timedelta(minutes=self.expiry_minutes)
+            # NumericDate claims (RFC 7519): integer seconds since the epoch
+            now = int(time.time())
+            expiry = now + self.expiry_minutes * 60
             
             payload = {
                 "iss": self.issuer,
@@ -73,15 +100,15 @@ class JWTHandler:
                 "exp": expiry
             }
             
-            token = jwt.encode(payload, self.private_key, algorithm="RS256")
+            token = jwt.encode(payload, self._private_key, algorithm="RS256")
             
-            self._get_logger().info(
+            get_logger().info(
                 f"Generated JWT token for {self.customer_id} "
                 f"(expires in {self.expiry_minutes} minutes)"
             )
-            self._get_logger().debug(f"Token payload: iss={self.issuer}, sub={self.customer_id}")
+            get_logger().debug(f"Token payload: iss={self.issuer}, sub={self.customer_id}")
             
-            return token
+            return token, expiry
             
         except Exception as e:
             raise JWTError(f"Failed to generate JWT token: {e}")
@@ -97,12 +124,15 @@ class JWTHandler:
             True if expired, False otherwise
         """
         try:
-            decoded = jwt.decode(token, options={"verify_signature": False})
-            exp_timestamp = decoded.get('exp')
+            # Read the exp claim straight from the payload segment; the
+            # signature is not checked here, so PyJWT is not needed
+            payload_b64 = token.split('.', 2)[1]
+            padding = '=' * (-len(payload_b64) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(payload_b64 + padding))
+            exp_timestamp = payload.get('exp')
             
             if exp_timestamp:
-                exp_datetime = datetime.datetime.fromtimestamp(exp_timestamp)
-                return datetime.datetime.utcnow() >= exp_datetime
+                return time.time() >= exp_timestamp
             
             return True  # No expiration means treat as expired
             
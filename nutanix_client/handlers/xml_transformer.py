@@ -3,51 +3,152 @@ XML transformation module for Nutanix API Client.
 Handles XML validation and SOAP envelope wrapping.
 """
 
+import copy
+import io
+import os
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Union
-import xml.etree.ElementTree as ET
+from typing import BinaryIO, Optional, Tuple, Union
 from lxml import etree
 
+from nutanix_client.core.logger import get_logger
+
+
+# Shared parser: no ID table, no network access, only internal (DTD-declared)
+# entities expanded, and no libxml2 size limits for very large purchase orders
+_PARSER = etree.XMLParser(
+    huge_tree=True,
+    collect_ids=False,
+    resolve_entities='internal',
+    no_network=True,
+)
+
 
 class XMLTransformError(Exception):
     """Raised when XML transformation fails."""
     pass
 
 
+def _namespace_declarations(nsmap: dict) -> Tuple[str, ...]:
+    """
+    Render namespace declarations the way lxml serializes them.
+    
+    Args:
+        nsmap: Prefix to namespace URI mapping (None for the default)
+        
+    Returns:
+        Tuple of ' xmlns:prefix="uri"' strings
+    """
+    decls = []
+    for prefix, uri in nsmap.items():
+        uri = (uri.replace('&', '&amp;').replace('<', '&lt;')
+               .replace('>', '&gt;').replace('"', '&quot;'))
+        if prefix is None:
+            decls.append(f' xmlns="{uri}"')
+        else:
+            decls.append(f' xmlns:{prefix}="{uri}"')
+    return tuple(decls)
+
+
+def _split_root_tags(root) -> Tuple[str, str]:
+    """
+    Serialize a root element's start tag and text, and its end tag.
+    
+    Args:
+        root: Root element whose text has been parsed
+        
+    Returns:
+        Tuple of (start tag plus text, end tag)
+    """
+    # A copy keeps the exact namespace declarations and attributes; a
+    # placeholder child marks where the children go. Text cannot contain a
+    # raw '<', so the last one before the end tag starts the placeholder.
+    shell = copy.copy(root)
+    del shell[:]
+    etree.SubElement(shell, root.tag)
+    markup = etree.tostring(shell, encoding='unicode', with_tail=False)
+    end = markup.rindex('</')
+    return markup[:markup.rindex('<', 0, end)], markup[end:]
+
+
+def _serialize_child(node, inherited: Tuple[str, ...]) -> str:
+    """
+    Serialize a top-level child with its tail, minus inherited namespaces.
+    
+    Args:
+        node: Element, comment or processing instruction under the root
+        inherited: Namespace declarations already made by the root
+        
+    Returns:
+        Markup as it appears inside the root in a full serialization
+    """
+    markup = etree.tostring(node, encoding='unicode', with_tail=True)
+    if not isinstance(node.tag, str):
+        return markup
+    # lxml escapes '>' in attribute values, so the first one ends the tag
+    end = markup.index('>')
+    start_tag = markup[:end]
+    for decl in inherited:
+        start_tag = start_tag.replace(decl, '', 1)
+    return start_tag + markup[end:]
+
+
+def _build_envelope_affixes(nsmap: dict) -> Tuple[str, str]:
+    """
+    Serialize the empty SOAP envelope once, split around the payload slot.
+    
+    Args:
+        nsmap: Namespace prefixes to declare on the Envelope element
+        
+    Returns:
+        Tuple of (markup before the payload, markup after the payload)
+    """
+    soapenv = '{%s}' % nsmap['soapenv']
+    envelope = etree.Element(soapenv + 'Envelope', nsmap=nsmap)
+    etree.SubElement(envelope, soapenv + 'Header')
+    body = etree.SubElement(envelope, soapenv + 'Body')
+    operation = etree.SubElement(body, '{%s}GetPurchaseOrder' % nsmap['tns'])
+    operation.text = '{content}'
+    prefix, suffix = etree.tostring(envelope, encoding='unicode').split('{content}')
+    return prefix, suffix
+
+
 class XMLTransformer:
     """
     Handles XML validation and SOAP envelope transformation.
     Detects if XML already has SOAP envelope and wraps it if needed.
     """
     
-    # SOAP envelope template
-    SOAP_TEMPLATE = '''<?xml version="1.0" encoding="UTF-8"?>
-<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"
-    xmlns:tns="http://www.boomi.com/connector/wss"
-    xmlns:ns1="http://www.nutanix.com/schemas/Services/Data/NTNXPartnerPO.xsd">
-    <soapenv:Header />
-    <soapenv:Body>
-        <tns:GetPurchaseOrder>
-{content}
-        </tns:GetPurchaseOrder>
-    </soapenv:Body>
-</soapenv:Envelope>'''
-    
-    def __init__(self):
-        """Initialize XML transformer."""
-        self.logger = None
-    
-    def _get_logger(self):
-        """Lazy logger initialization."""
-        if self.logger is None:
-            from nutanix_client.core.logger import get_logger
-            self.logger = get_logger()
-        return self.logger
+    # Namespaces declared on the generated SOAP envelope
+    SOAP_NSMAP = {
+        'soapenv': 'http://schemas.xmlsoap.org/soap/envelope/',
+        'tns': 'http://www.boomi.com/connector/wss',
+        'ns1': 'http://www.nutanix.com/schemas/Services/Data/NTNXPartnerPO.xsd',
+    }
+    
+    XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+    
+    # Envelope markup serialized once; wrapping concatenates around the payload
+    _SOAP_PREFIX, _SOAP_SUFFIX = _build_envelope_affixes(SOAP_NSMAP)
+    _SOAP_PREFIX = XML_DECLARATION + _SOAP_PREFIX
+    
+    # Files larger than this are wrapped incrementally instead of via a full DOM
+    STREAM_THRESHOLD_BYTES = 2 * 1024 * 1024
+    
+    # Root tags that identify an existing SOAP envelope (SOAP 1.1 and 1.2)
+    SOAP_ENVELOPE_TAGS = frozenset({
+        '{http://schemas.xmlsoap.org/soap/envelope/}Envelope',
+        '{http://www.w3.org/2003/05/soap-envelope}Envelope',
+    })
     
     def transform_file(self, input_path: Union[str, Path]) -> str:
         """
         Transform an XML file, adding SOAP envelope if needed.
         
+        The file is parsed directly by libxml2, without reading it into a
+        Python string first. Files above STREAM_THRESHOLD_BYTES are wrapped
+        incrementally so the full document tree is never held in memory.
+        
         Args:
             input_path: Path to input XML file
             
@@ -58,89 +159,236 @@ class XMLTransformer:
             XMLTransformError: If transformation fails
         """
         try:
-            with open(input_path, 'r', encoding='utf-8') as f:
-                xml_content = f.read()
-            
-            self._get_logger().debug(f"Read XML file: {input_path}")
-            return self.transform_string(xml_content)
-            
-        except FileNotFoundError:
-            raise XMLTransformError(f"XML file not found: {input_path}")
-        except Exception as e:
+            large = os.path.getsize(input_path) > self.STREAM_THRESHOLD_BYTES
+        except OSError:
+            # Let the parse below report the missing/unreadable file
+            large = False
+        
+        try:
+            if large:
+                soap_xml = self._stream_wrap_file(input_path)
+                if soap_xml is not None:
+                    return soap_xml
+            tree = etree.parse(str(input_path), _PARSER)
+        except etree.XMLSyntaxError as e:
+            get_logger().error(f"XML syntax error: {e}")
+            raise XMLTransformError("Invalid XML syntax")
+        except OSError as e:
+            if not Path(input_path).exists():
+                raise XMLTransformError(f"XML file not found: {input_path}")
             raise XMLTransformError(f"Error reading XML file: {e}")
+        
+        get_logger().debug(f"Read XML file: {input_path}")
+        root = tree.getroot()
+        
+        # Check if already has SOAP envelope
+        if self._has_soap_envelope(root):
+            get_logger().info("XML already has SOAP envelope, no transformation needed")
+            return self.XML_DECLARATION + etree.tostring(tree, encoding='unicode')
+        
+        # Wrap with SOAP envelope
+        get_logger().info("Adding SOAP envelope to XML")
+        return self._wrap_with_soap(root)
     
-    def transform_string(self, xml_content: str) -> str:
+    def transform_string(self, xml_content: Union[str, bytes]) -> Union[str, bytes]:
         """
         Transform XML string, adding SOAP envelope if needed.
         
         Args:
-            xml_content: XML content as string
+            xml_content: XML content as string or encoded bytes
             
         Returns:
-            Transformed XML string
+            Transformed XML string, or the input unchanged if it already has
+            a SOAP envelope
             
         Raises:
             XMLTransformError: If transformation fails
         """
-        # Validate XML syntax
-        if not self._is_valid_xml(xml_content):
+        if isinstance(xml_content, str):
+            xml_bytes = xml_content.encode('utf-8')
+        else:
+            xml_bytes = xml_content
+        
+        # Parse once; the tree is reused for the envelope check and wrapping
+        try:
+            root = etree.fromstring(xml_bytes, _PARSER)
+        except etree.XMLSyntaxError as e:
+            get_logger().error(f"XML syntax error: {e}")
+            raise XMLTransformError("Invalid XML syntax")
+        except Exception as e:
+            get_logger().error(f"XML validation error: {e}")
             raise XMLTransformError("Invalid XML syntax")
         
         # Check if already has SOAP envelope
-        if self._has_soap_envelope(xml_content):
-            self._get_logger().info("XML already has SOAP envelope, no transformation needed")
+        if self._has_soap_envelope(root):
+            get_logger().info("XML already has SOAP envelope, no transformation needed")
             return xml_content
         
         # Wrap with SOAP envelope
-        self._get_logger().info("Adding SOAP envelope to XML")
-        return self._wrap_with_soap(xml_content)
+        get_logger().info("Adding SOAP envelope to XML")
+        return self._wrap_with_soap(root)
     
-    def _is_valid_xml(self, xml_content: str) -> bool:
+    def _stream_wrap_file(self, input_path: Union[str, Path]) -> Optional[str]:
         """
-        Check if string is valid XML.
+        Wrap a large XML file with a SOAP envelope without building its DOM.
+        
+        Each top-level node of the root (element, comment or processing
+        instruction) is serialized once it and its trailing text have been
+        parsed, then discarded, so memory is bounded by the largest child
+        rather than the whole document. The output is the same as the DOM
+        path produces.
         
         Args:
-            xml_content: XML content to validate
+            input_path: Path to input XML file
             
         Returns:
-            True if valid, False otherwise
+            SOAP-wrapped XML string, or None if the document already has a
+            SOAP envelope (the caller then uses the regular DOM path)
+        """
+        get_logger().debug(f"Streaming large XML file: {input_path}")
+        events = iter(etree.iterparse(
+            str(input_path),
+            events=('start', 'end', 'comment', 'pi'),
+            huge_tree=True,
+            resolve_entities='internal',
+            no_network=True,
+        ))
+        # Skip comments/PIs before the root element
+        for event, root in events:
+            if event == 'start':
+                break
+        
+        # Existing envelopes are re-serialized like any other size would be
+        if self._has_soap_envelope(root):
+            return None
+        
+        get_logger().info("Adding SOAP envelope to XML")
+        self._check_root(root)
+        
+        # Serializing a child on its own repeats every namespace in scope at
+        # the root; those declarations are already on the root start tag
+        inherited = _namespace_declarations(root.nsmap)
+        
+        out = io.StringIO()
+        out.write(self._SOAP_PREFIX)
+        root_end = None
+        pending = None
+        
+        for event, node in events:
+            if node is root:
+                break
+            if node.getparent() is not root:
+                continue
+            
+            if root_end is None:
+                # root.text is complete once its first child begins
+                root_start, root_end = _split_root_tags(root)
+                out.write(root_start)
+            
+            # A new top-level node begins: the previous one's tail is known
+            if event != 'end' and pending is not None:
+                out.write(_serialize_child(pending, inherited))
+                pending.clear(keep_tail=False)
+                pending = None
+                while root[0] is not node:
+                    del root[0]
+            
+            if event != 'start':
+                pending = node
+        
+        if root_end is None:
+            # No child nodes; the root is small and complete
+            out.write(etree.tostring(root, encoding='unicode', with_tail=False))
+        else:
+            if pending is not None:
+                out.write(_serialize_child(pending, inherited))
+            out.write(root_end)
+        out.write(self._SOAP_SUFFIX)
+        
+        get_logger().debug("Successfully wrapped XML with SOAP envelope")
+        return out.getvalue()
+    
+    def write_soap_to(self, dst: Union[str, Path, BinaryIO], root) -> None:
+        """
+        Write a SOAP-wrapped document straight to a file or stream.
+        
+        Unlike transform_file/transform_string, the output is written
+        incrementally with etree.xmlfile and never materialized as a
+        Python string.
+        
+        Args:
+            dst: Output file path or binary file object
+            root: Parsed root element of the raw XML or of an existing
+                SOAP envelope
+            
+        Raises:
+            XMLTransformError: If writing fails
         """
         try:
-            etree.fromstring(xml_content.encode('utf-8'))
-            return True
-        except etree.XMLSyntaxError as e:
-            self._get_logger().error(f"XML syntax error: {e}")
-            return False
+            with etree.xmlfile(str(dst) if isinstance(dst, Path) else dst,
+                               encoding='utf-8') as xf:
+                xf.write_declaration()
+                if self._has_soap_envelope(root):
+                    xf.write(root)
+                else:
+                    self._check_root(root)
+                    with self._soap_operation(xf):
+                        xf.write(root, with_tail=False)
         except Exception as e:
-            self._get_logger().error(f"XML validation error: {e}")
-            return False
+            raise XMLTransformError(f"Failed to write SOAP XML: {e}")
+        
+        get_logger().debug(f"Wrote SOAP XML to {dst}")
+    
+    @contextmanager
+    def _soap_operation(self, xf):
+        """
+        Open the SOAP envelope on an xmlfile writer.
+        
+        Args:
+            xf: Active etree.xmlfile writer
+            
+        Yields:
+            Control inside the GetPurchaseOrder element
+        """
+        soapenv = '{%s}' % self.SOAP_NSMAP['soapenv']
+        with xf.element(soapenv + 'Envelope', nsmap=self.SOAP_NSMAP):
+            with xf.element(soapenv + 'Header'):
+                pass
+            with xf.element(soapenv + 'Body'):
+                with xf.element('{%s}GetPurchaseOrder' % self.SOAP_NSMAP['tns']):
+                    yield
     
-    def _has_soap_envelope(self, xml_content: str) -> bool:
+    def _has_soap_envelope(self, root) -> bool:
         """
         Check if XML already has SOAP envelope.
         
         Args:
-            xml_content: XML content to check
+            root: Parsed root element
             
         Returns:
-            True if has SOAP envelope, False otherwise
+            True if the root element is a SOAP 1.1 or 1.2 Envelope
         """
-        try:
-            # Check for SOAP envelope indicators
-            return (
-                'soap:Envelope' in xml_content or
-                'soapenv:Envelope' in xml_content or
-                'SOAP-ENV:Envelope' in xml_content
+        return root.tag in self.SOAP_ENVELOPE_TAGS
+    
+    def _check_root(self, root) -> None:
+        """
+        Warn if the payload root is not the expected DistiPODataRq element.
+        
+        Args:
+            root: Root element of the raw XML
+        """
+        if 'DistiPODataRq' not in root.tag:
+            get_logger().warning(
+                f"Root element is '{root.tag}', expected 'DistiPODataRq'. "
+                "Proceeding anyway."
             )
-        except Exception:
-            return False
     
-    def _wrap_with_soap(self, xml_content: str) -> str:
+    def _wrap_with_soap(self, root) -> str:
         """
         Wrap XML content with SOAP envelope.
         
         Args:
-            xml_content: Raw XML content
+            root: Parsed root element of the raw XML
             
         Returns:
             SOAP-wrapped XML string
@@ -149,41 +397,18 @@ class XMLTransformer:
             XMLTransformError: If wrapping fails
         """
         try:
-            # Parse the input XML to extract the content
-            root = etree.fromstring(xml_content.encode('utf-8'))
-            
-            # Check if root is DistiPODataRq
-            if 'DistiPODataRq' not in root.tag:
-                self._get_logger().warning(
-                    f"Root element is '{root.tag}', expected 'DistiPODataRq'. "
-                    "Proceeding anyway."
-                )
-            
-            # Convert the element to string with proper indentation
-            content_str = etree.tostring(
-                root, 
-                encoding='unicode', 
-                pretty_print=True
-            )
-            
-            # Indent the content for proper formatting inside SOAP body
-            indented_content = '\n'.join(
-                '            ' + line if line.strip() else line
-                for line in content_str.split('\n')
-            ).rstrip()
-            
-            # Insert into SOAP template
-            soap_xml = self.SOAP_TEMPLATE.format(content=indented_content)
+            self._check_root(root)
             
-            # Validate the result
-            if not self._is_valid_xml(soap_xml):
-                raise XMLTransformError("Generated SOAP XML is invalid")
+            # Only the payload is serialized; the envelope is fixed text
+            soap_xml = (
+                self._SOAP_PREFIX
+                + etree.tostring(root, encoding='unicode', with_tail=False)
+                + self._SOAP_SUFFIX
+            )
             
-            self._get_logger().debug("Successfully wrapped XML with SOAP envelope")
+            get_logger().debug("Successfully wrapped XML with SOAP envelope")
             return soap_xml
             
-        except etree.XMLSyntaxError as e:
-            raise XMLTransformError(f"XML parsing error: {e}")
         except Exception as e:
             raise XMLTransformError(f"Failed to wrap XML with SOAP envelope: {e}")
     
@@ -198,7 +423,7 @@ class XMLTransformer:
             Formatted XML string
         """
         try:
-            root = etree.fromstring(xml_content.encode('utf-8'))
+            root = etree.fromstring(xml_content.encode('utf-8'), _PARSER)
             return etree.tostring(
                 root,
                 encoding='unicode',
@@ -206,5 +431,5 @@ class XMLTransformer:
                 xml_declaration=True
             )
         except Exception as e:
-            self._get_logger().warning(f"Could not pretty print XML: {e}")
+            get_logger().warning(f"Could not pretty print XML: {e}")
             return xml_content
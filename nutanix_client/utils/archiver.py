@@ -3,7 +3,11 @@ Utility functions for Nutanix API Client.
 Provides file handling, archiving, and helper functions.
 """
 
+import codecs
+import errno
+import logging
 import os
+import stat
 import sys
 import shutil
 import time
@@ -11,6 +15,25 @@ from pathlib import Path
 from typing import Optional
 from datetime import datetime, timedelta
 
+from nutanix_client.core.logger import get_logger
+
+
+# Archive timestamp for the current second plus a counter that keeps names
+# unique when several files are archived within that second
+_ts_cache = {'t': 0, 's': '', 'n': 0}
+
+
+def _archive_timestamp() -> str:
+    """Return a unique "%Y%m%d_%H%M%S[_n]" suffix for archived filenames."""
+    now = int(time.time())
+    if now != _ts_cache['t']:
+        _ts_cache.update(
+            t=now, s=time.strftime("%Y%m%d_%H%M%S", time.localtime(now)), n=0
+        )
+        return _ts_cache['s']
+    _ts_cache['n'] += 1
+    return f"{_ts_cache['s']}_{_ts_cache['n']}"
+
 
 class FileArchiver:
     """Handles file archiving operations."""
@@ -25,19 +48,11 @@ class FileArchiver:
         """
         self.success_path = success_path
         self.error_path = error_path
-        self.logger = None
         
         # Ensure archive directories exist
         self.success_path.mkdir(parents=True, exist_ok=True)
         self.error_path.mkdir(parents=True, exist_ok=True)
     
-    def _get_logger(self):
-        """Lazy logger initialization."""
-        if self.logger is None:
-            from nutanix_client.core.logger import get_logger
-            self.logger = get_logger()
-        return self.logger
-    
     def archive_success(self, file_path: Path) -> Path:
         """
         Archive a successfully processed file.
@@ -66,14 +81,24 @@ class FileArchiver:
         # Save error log if provided
         if error_message:
             error_log_path = archived_file.with_suffix('.error.txt')
+            payload = (
+                f"Error occurred at: {datetime.now().isoformat()}\n"
+                f"Original file: {file_path}\n"
+                f"\nError message:\n{error_message}\n"
+            ).encode('utf-8')
             try:
-                with open(error_log_path, 'w', encoding='utf-8') as f:
-                    f.write(f"Error occurred at: {datetime.now().isoformat()}\n")
-                    f.write(f"Original file: {file_path}\n")
-                    f.write(f"\nError message:\n{error_message}\n")
-                self._get_logger().debug(f"Saved error log: {error_log_path}")
+                # Write the log straight to the descriptor, bypassing Python's
+                # buffered I/O; os.write may be partial, so loop until done
+                fd = os.open(error_log_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+                try:
+                    view = memoryview(payload)
+                    while view:
+                        view = view[os.write(fd, view):]
+                finally:
+                    os.close(fd)
+                get_logger().debug(f"Saved error log: {error_log_path}")
             except Exception as e:
-                self._get_logger().warning(f"Could not save error log: {e}")
+                get_logger().warning(f"Could not save error log: {e}")
         
         return archived_file
     
@@ -92,21 +117,27 @@ class FileArchiver:
         """
         try:
             # Generate archived filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = _archive_timestamp()
             archived_filename = f"{file_path.stem}_{timestamp}{file_path.suffix}"
             archived_path = archive_dir / archived_filename
             
-            # Move file to archive
-            shutil.move(str(file_path), str(archived_path))
+            # Move file to archive; on the same filesystem this is a single
+            # atomic rename, otherwise fall back to copy and delete
+            try:
+                os.replace(file_path, archived_path)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                shutil.move(str(file_path), str(archived_path))
             
-            self._get_logger().info(
+            get_logger().info(
                 f"Archived file to {archive_type}: {file_path.name} -> {archived_path}"
             )
             
             return archived_path
             
         except Exception as e:
-            self._get_logger().error(f"Failed to archive file {file_path}: {e}")
+            get_logger().error(f"Failed to archive file {file_path}: {e}")
             raise
     
     def cleanup_old_archives(self, days: int, dry_run: bool = False) -> tuple[int, int]:
@@ -121,10 +152,14 @@ class FileArchiver:
             Tuple of (files_deleted, total_size_freed_bytes)
         """
         cutoff_date = datetime.now() - timedelta(days=days)
+        cutoff_ts = cutoff_date.timestamp()
         files_deleted = 0
         size_freed = 0
+        logger = get_logger()
+        # Per-file messages are only formatted when INFO is enabled
+        log_each = logger.isEnabledFor(logging.INFO)
         
-        self._get_logger().info(
+        logger.info(
             f"Cleaning up archives older than {days} days "
             f"(before {cutoff_date.strftime('%Y-%m-%d')})"
         )
@@ -133,41 +168,61 @@ class FileArchiver:
             if not archive_dir.exists():
                 continue
             
-            for file_path in archive_dir.glob('*'):
-                if not file_path.is_file():
-                    continue
-                
-                # Check file modification time
-                mtime = datetime.fromtimestamp(file_path.stat().st_mtime)
-                
-                if mtime < cutoff_date:
-                    file_size = file_path.stat().st_size
+            # One pass over the directory: the DirEntry stat result answers
+            # both the type and age checks, and no Path objects are built
+            with os.scandir(archive_dir) as entries:
+                for entry in entries:
+                    st = entry.stat(follow_symlinks=False)
+                    if not stat.S_ISREG(st.st_mode) or st.st_mtime >= cutoff_ts:
+                        continue
+                    
+                    file_size = st.st_size
                     
                     if dry_run:
-                        self._get_logger().info(
-                            f"Would delete: {file_path} "
-                            f"({file_size / 1024:.1f} KB, modified {mtime.strftime('%Y-%m-%d')})"
-                        )
+                        if log_each:
+                            mtime = datetime.fromtimestamp(st.st_mtime)
+                            logger.info(
+                                f"Would delete: {entry.path} "
+                                f"({file_size / 1024:.1f} KB, modified {mtime.strftime('%Y-%m-%d')})"
+                            )
                     else:
                         try:
-                            file_path.unlink()
-                            self._get_logger().info(f"Deleted: {file_path}")
+                            os.unlink(entry.path)
+                            if log_each:
+                                logger.info(f"Deleted: {entry.path}")
                             files_deleted += 1
                             size_freed += file_size
                         except Exception as e:
-                            self._get_logger().error(f"Failed to delete {file_path}: {e}")
+                            logger.error(f"Failed to delete {entry.path}: {e}")
         
         if not dry_run:
-            self._get_logger().info(
+            logger.info(
                 f"Cleanup complete: {files_deleted} files deleted, "
                 f"{size_freed / 1024 / 1024:.2f} MB freed"
             )
         else:
-            self._get_logger().info(f"Dry run: {files_deleted} files would be deleted")
+            logger.info(f"Dry run: {files_deleted} files would be deleted")
         
         return files_deleted, size_freed
 
 
+def _report(level: int, msg: str) -> None:
+    """
+    Log a validation message, or print it if logging is not set up yet.
+    
+    Args:
+        level: Logging level (e.g. logging.ERROR)
+        msg: Message to report
+    """
+    try:
+        logger = get_logger()
+    except Exception:
+        # Logger not initialized yet, just use print
+        print(f"{logging.getLevelName(level)}: {msg}", file=sys.stderr)
+        return
+    logger.log(level, msg)
+
+
 def validate_xml_file(file_path: Path) -> bool:
     """
     Validate that a file exists and appears to be XML.
@@ -178,54 +233,38 @@ def validate_xml_file(file_path: Path) -> bool:
     Returns:
         True if valid, False otherwise
     """
+    # One stat call answers both "exists" and "is a regular file"
     try:
-        from nutanix_client.core.logger import get_logger
-        logger = get_logger()
-    except:
-        # Logger not initialized yet, just use print
-        logger = None
-    
-    if not file_path.exists():
-        msg = f"File not found: {file_path}"
-        if logger:
-            logger.error(msg)
-        else:
-            print(f"ERROR: {msg}", file=sys.stderr)
+        st = os.stat(file_path)
+    except (FileNotFoundError, NotADirectoryError):
+        _report(logging.ERROR, f"File not found: {file_path}")
+        return False
+    except OSError as e:
+        _report(logging.ERROR, f"Error accessing file {file_path}: {e}")
         return False
     
-    if not file_path.is_file():
-        msg = f"Not a file: {file_path}"
-        if logger:
-            logger.error(msg)
-        else:
-            print(f"ERROR: {msg}", file=sys.stderr)
+    if not stat.S_ISREG(st.st_mode):
+        _report(logging.ERROR, f"Not a file: {file_path}")
         return False
     
     # Check file extension
     if file_path.suffix.lower() not in ['.xml', '.txt']:
-        msg = f"File does not have .xml extension: {file_path}"
-        if logger:
-            logger.warning(msg)
-        else:
-            print(f"WARNING: {msg}", file=sys.stderr)
+        _report(logging.WARNING, f"File does not have .xml extension: {file_path}")
     
-    # Basic check for XML content
+    # Basic check for XML content; a few raw bytes are enough to see '<'
+    # once an optional UTF-8 byte order mark is skipped
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            first_line = f.readline().strip()
-            if not (first_line.startswith('<?xml') or first_line.startswith('<')):
-                msg = f"File does not appear to be XML: {file_path}"
-                if logger:
-                    logger.error(msg)
-                else:
-                    print(f"ERROR: {msg}", file=sys.stderr)
-                return False
+        with open(file_path, 'rb') as f:
+            head = f.read(16)
+            if head.startswith(codecs.BOM_UTF8):
+                head = head[len(codecs.BOM_UTF8):]
+            head = head.lstrip()
     except Exception as e:
-        msg = f"Error reading file {file_path}: {e}"
-        if logger:
-            logger.error(msg)
-        else:
-            print(f"ERROR: {msg}", file=sys.stderr)
+        _report(logging.ERROR, f"Error reading file {file_path}: {e}")
+        return False
+    
+    if not head.startswith(b'<'):
+        _report(logging.ERROR, f"File does not appear to be XML: {file_path}")
         return False
     
     return True
@@ -259,9 +298,7 @@ def format_duration(seconds: float) -> str:
     """
     if seconds < 1:
         return f"{seconds * 1000:.0f}ms"
-    elif seconds < 60:
+    if seconds < 60:
         return f"{seconds:.1f}s"
-    else:
-        minutes = int(seconds // 60)
-        secs = int(seconds % 60)
-        return f"{minutes}m {secs}s"
+    minutes, secs = divmod(int(seconds), 60)
+    return f"{minutes}m {secs}s"
@@ -34,8 +34,10 @@ setup(
         "PyJWT>=2.8.0",
         "cryptography>=41.0.0",
         "requests>=2.31.0",
+        "urllib3>=1.26.0",
         "PyYAML>=6.0",
-        "lxml>=4.9.3",
+        "lxml>=5.0.0",
+        "watchdog>=3.0.0",
     ],
     entry_points={
         'console_scripts': [
@@ -0,0 +1,98 @@
+"""
+Tests for Config's parsed JSON cache (config.yaml.json).
+"""
+
+import json
+import os
+import stat
+
+import pytest
+
+from nutanix_client.core.config import Config
+
+
+CONFIG_TEMPLATE = '''environment: uat
+api:
+  uat:
+    url: https://uat.example/po
+  production:
+    url: https://prod.example/po
+jwt:
+  issuer: ACME
+  customer_id: {customer_id}
+  private_key_path: {key_path}
+paths:
+  input: {root}/in
+  output: {root}/out
+  archive_success: {root}/archive/success
+  archive_error: {root}/archive/error
+logging:
+  level:
+    uat: DEBUG
+    production: INFO
+'''
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    key_path = tmp_path / 'private_key.pem'
+    key_path.write_text('not a real key')
+
+    def write(customer_id='CUST-1', extra=''):
+        path = tmp_path / 'config.yaml'
+        path.write_text(CONFIG_TEMPLATE.format(
+            customer_id=customer_id, key_path=key_path, root=tmp_path
+        ) + extra)
+        return path
+
+    return write
+
+
+def _cache_path(config_path):
+    return config_path.with_name(config_path.name + '.json')
+
+
+def test_cache_hit_skips_yaml(config_file):
+    path = config_file()
+    Config(str(path))
+
+    # Tamper with the cached copy only: a hit must return it as-is
+    cache = json.loads(_cache_path(path).read_text())
+    cache['config']['jwt']['customer_id'] = 'FROM-CACHE'
+    _cache_path(path).write_text(json.dumps(cache))
+
+    assert Config(str(path)).jwt_customer_id == 'FROM-CACHE'
+
+
+def test_cache_rebuilt_when_yaml_changes(config_file):
+    path = config_file()
+    assert Config(str(path)).jwt_customer_id == 'CUST-1'
+
+    path = config_file(customer_id='CUST-22')
+
+    assert Config(str(path)).jwt_customer_id == 'CUST-22'
+    cache = json.loads(_cache_path(path).read_text())
+    assert cache['config']['jwt']['customer_id'] == 'CUST-22'
+
+
+def test_cache_skipped_when_json_changes_config(config_file):
+    # JSON would turn the integer key into the string '1'
+    path = config_file(extra='codes:\n  1: one\n')
+
+    config = Config(str(path))
+
+    assert config._config['codes'] == {1: 'one'}
+    assert not _cache_path(path).exists()
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='POSIX permissions')
+def test_cache_keeps_yaml_permissions(config_file):
+    path = config_file()
+    os.chmod(path, 0o600)
+    old_umask = os.umask(0o022)
+    try:
+        Config(str(path))
+    finally:
+        os.umask(old_umask)
+
+    assert stat.S_IMODE(_cache_path(path).stat().st_mode) == 0o600
@@ -0,0 +1,93 @@
+"""
+Tests for XMLTransformer: the streaming large-file path must produce the
+same SOAP document as the regular DOM path.
+"""
+
+import pytest
+from lxml import etree
+
+from nutanix_client.core.logger import Logger
+from nutanix_client.handlers.xml_transformer import XMLTransformer
+
+
+NS = 'http://www.nutanix.com/schemas/Services/Data/NTNXPartnerPO.xsd'
+
+NAMESPACED_PO = f'''<?xml version="1.0" encoding="UTF-8"?>
+<!-- exported by ERP -->
+<ns1:DistiPODataRq xmlns:ns1="{NS}" xmlns:q="urn:example:q" q:version="2">
+  <ns1:Header>
+    <ns1:DistiPONumber>PO-1</ns1:DistiPONumber>
+  </ns1:Header>
+''' + ''.join(
+    f'''  <ns1:Line q:n="{i}">
+    <ns1:Sku>SKU-{i}</ns1:Sku>
+    <q:Note>a &amp; b &lt; c</q:Note>
+  </ns1:Line>
+''' for i in range(200)
+) + '''</ns1:DistiPODataRq>
+'''
+
+MIXED_CONTENT_PO = '''<?xml version="1.0" encoding="UTF-8"?>
+<DistiPODataRq xmlns="urn:example:po">HEAD<a x="1&gt;0">text</a>tail-a<!-- note -->tail-comment<?pi data?>tail-pi<b/>
+<c><d/></c>END</DistiPODataRq>
+<!-- trailing -->
+'''
+
+EMPTY_ROOT_PO = '<DistiPODataRq xmlns:ns1="urn:x">only text</DistiPODataRq>'
+
+
+@pytest.fixture(scope='module', autouse=True)
+def logger(tmp_path_factory):
+    """Initialize the application logger the transformer writes to."""
+    Logger.initialize(tmp_path_factory.mktemp('logs') / 'test.log', 'WARNING')
+
+
+def _both_paths(path):
+    """Transform a file through the DOM path and the streaming path."""
+    transformer = XMLTransformer()
+    transformer.STREAM_THRESHOLD_BYTES = float('inf')
+    dom = transformer.transform_file(path)
+    transformer.STREAM_THRESHOLD_BYTES = 0
+    streamed = transformer.transform_file(path)
+    return dom, streamed
+
+
+def _c14n(xml):
+    return etree.tostring(etree.fromstring(xml.encode('utf-8')), method='c14n')
+
+
+@pytest.mark.parametrize('content', [
+    NAMESPACED_PO,
+    MIXED_CONTENT_PO,
+    EMPTY_ROOT_PO,
+], ids=['namespaced', 'mixed-content', 'empty-root'])
+def test_streaming_matches_dom_path(tmp_path, content):
+    path = tmp_path / 'po.xml'
+    path.write_text(content, encoding='utf-8')
+    
+    dom, streamed = _both_paths(path)
+    
+    assert _c14n(streamed) == _c14n(dom)
+    assert len(streamed) == len(dom)
+    assert streamed == dom
+
+
+def test_streaming_keeps_mixed_content(tmp_path):
+    path = tmp_path / 'po.xml'
+    path.write_text(MIXED_CONTENT_PO, encoding='utf-8')
+    
+    _, streamed = _both_paths(path)
+    
+    for text in ('HEAD', 'tail-a', '<!-- note -->', 'tail-comment',
+                 '<?pi data?>', 'tail-pi', 'END'):
+        assert text in streamed
+    assert 'trailing' not in streamed
+
+
+def test_streaming_does_not_repeat_namespaces(tmp_path):
+    path = tmp_path / 'po.xml'
+    path.write_text(NAMESPACED_PO, encoding='utf-8')
+    
+    _, streamed = _both_paths(path)
+    
+    assert streamed.count(f'xmlns:ns1="{NS}"') == 2  # envelope and payload root